@@ -4,10 +4,23 @@ Professional UI connecting to FastAPI backend
 """
 
 import streamlit as st
+import pandas as pd
 import requests
-from datetime import datetime
+from requests.adapters import HTTPAdapter
 import time
-from typing import Optional, Dict, List
+import os
+from typing import Optional, Dict
+
+# Seconds before the cached task list is re-fetched from the backend;
+# set TASKS_CACHE_TTL higher on hosted deployments to poll less often
+TASKS_CACHE_TTL = int(os.environ.get("TASKS_CACHE_TTL", "30"))
+
+# Task card CSS classes by status
+STATUS_CLASS = {
+    "TODO": "task-card status-todo",
+    "IN PROGRESS": "task-card status-inprogress",
+    "DONE": "task-card status-done"
+}
 
 # Page configuration
 st.set_page_config(
@@ -62,8 +75,12 @@ if 'show_create_form' not in st.session_state:
     st.session_state.show_create_form = False
 if 'connection_status' not in st.session_state:
     st.session_state.connection_status = None
-if 'stats' not in st.session_state:
-    st.session_state.stats = None
+if 'show_stats' not in st.session_state:
+    st.session_state.show_stats = False
+if 'dashboard_cache' not in st.session_state:
+    st.session_state.dashboard_cache = None
+if 'dirty' not in st.session_state:
+    st.session_state.dirty = False
 
 
 class APIClient:
@@ -72,11 +89,18 @@ class APIClient:
     def __init__(self, base_url: str):
         self.base_url = base_url
         self.timeout = 30
+        
+        # Reuse connections (keep-alive) across calls instead of a new
+        # TCP/TLS handshake per request
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=10)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
     
     def health_check(self) -> tuple[bool, str]:
         """Check API health"""
         try:
-            response = requests.get(
+            response = self._session.get(
                 f"{self.base_url}/health",
                 timeout=10
             )
@@ -87,27 +111,10 @@ class APIClient:
         except requests.exceptions.RequestException as e:
             return False, f"❌ Connection failed: {str(e)}"
     
-    def get_tasks(self, status_filter: Optional[str] = None) -> Dict:
-        """Get all tasks"""
-        try:
-            params = {}
-            if status_filter:
-                params['status_filter'] = status_filter
-            
-            response = requests.get(
-                f"{self.base_url}/api/v1/tasks",
-                params=params,
-                timeout=self.timeout
-            )
-            response.raise_for_status()
-            return {"success": True, "data": response.json()}
-        except Exception as e:
-            return {"success": False, "error": str(e)}
-    
     def create_task(self, task_data: Dict) -> Dict:
         """Create a new task"""
         try:
-            response = requests.post(
+            response = self._session.post(
                 f"{self.base_url}/api/v1/tasks",
                 json=task_data,
                 timeout=self.timeout
@@ -120,7 +127,7 @@ class APIClient:
     def update_task(self, task_name: str, update_data: Dict) -> Dict:
         """Update a task"""
         try:
-            response = requests.put(
+            response = self._session.put(
                 f"{self.base_url}/api/v1/tasks/{task_name}",
                 json=update_data,
                 timeout=self.timeout
@@ -133,7 +140,7 @@ class APIClient:
     def delete_task(self, task_name: str) -> Dict:
         """Delete a task"""
         try:
-            response = requests.delete(
+            response = self._session.delete(
                 f"{self.base_url}/api/v1/tasks/{task_name}",
                 timeout=self.timeout
             )
@@ -145,7 +152,7 @@ class APIClient:
     def send_message(self, message: str, session_id: str = "streamlit") -> Dict:
         """Send natural language message"""
         try:
-            response = requests.post(
+            response = self._session.post(
                 f"{self.base_url}/api/v1/message",
                 json={"message": message, "session_id": session_id},
                 timeout=self.timeout
@@ -155,21 +162,32 @@ class APIClient:
         except Exception as e:
             return {"success": False, "error": str(e)}
     
-    def get_stats(self) -> Dict:
-        """Get task statistics"""
+    def get_dashboard(self, status_filter: Optional[str] = None) -> Dict:
+        """Get tasks, statistics and backend health in one request"""
         try:
-            response = requests.get(
-                f"{self.base_url}/api/v1/stats",
+            params = {}
+            if status_filter:
+                params['status_filter'] = status_filter
+            
+            response = self._session.get(
+                f"{self.base_url}/api/v1/dashboard",
+                params=params,
                 timeout=self.timeout
             )
             response.raise_for_status()
             return {"success": True, "data": response.json()}
         except Exception as e:
             return {"success": False, "error": str(e)}
+    
+
+@st.cache_resource
+def get_api_client(base_url: str) -> APIClient:
+    """Get a shared API client (and its connection pool) per backend URL"""
+    return APIClient(base_url)
 
 
 # Initialize API client
-api_client = APIClient(st.session_state.api_url)
+api_client = get_api_client(st.session_state.api_url)
 
 # Sidebar
 with st.sidebar:
@@ -184,16 +202,18 @@ with st.sidebar:
     
     if api_url != st.session_state.api_url:
         st.session_state.api_url = api_url
-        api_client = APIClient(api_url)
+        api_client = get_api_client(api_url)
         st.session_state.connection_status = None
+        st.session_state.dirty = True
         st.rerun()
     
     # Test connection
     if st.button("🔌 Test Connection", use_container_width=True):
         with st.spinner("Testing connection..."):
             success, message = api_client.health_check()
-            st.session_state.connection_status = (success, message)
-            st.rerun()
+            if st.session_state.connection_status != (success, message):
+                st.session_state.connection_status = (success, message)
+                st.rerun()
     
     if st.session_state.connection_status:
         success, message = st.session_state.connection_status
@@ -222,6 +242,7 @@ with st.sidebar:
     st.divider()
     
     if st.button("🔄 Refresh Data", use_container_width=True):
+        st.session_state.dirty = True
         st.rerun()
     
     st.divider()
@@ -246,19 +267,38 @@ with col1:
 
 with col2:
     if st.button("📊 View Stats", use_container_width=True):
-        result = api_client.get_stats()
-        if result["success"]:
-            st.session_state.stats = result["data"]
+        st.session_state.show_stats = not st.session_state.show_stats
 
 st.divider()
 
+# Fetch tasks, stats and backend health in a single round trip
+filter_param = None if status_filter == "All" else status_filter
+
+# Reuse the last result across reruns until it expires or a mutation occurred
+cached = st.session_state.dashboard_cache
+if not st.session_state.api_url:
+    dashboard = {"success": False, "error": "No backend URL configured"}
+elif (
+    cached
+    and not st.session_state.dirty
+    and cached[1] == filter_param
+    and time.monotonic() - cached[0] < TASKS_CACHE_TTL
+):
+    dashboard = cached[2]
+else:
+    with st.spinner("Loading tasks..."):
+        dashboard = api_client.get_dashboard(filter_param)
+    if dashboard["success"]:
+        st.session_state.dashboard_cache = (time.monotonic(), filter_param, dashboard)
+        st.session_state.dirty = False
+
 # Display Stats
-if st.session_state.stats:
+if st.session_state.show_stats and dashboard["success"]:
     st.subheader("📊 Task Statistics")
     
     col1, col2, col3, col4 = st.columns(4)
     
-    stats = st.session_state.stats
+    stats = dashboard["data"].get("stats", {})
     
     with col1:
         st.metric("Total Tasks", stats.get("total_tasks", 0))
@@ -308,6 +348,7 @@ if st.session_state.show_create_form:
                     
                     if result["success"]:
                         st.success(f"✅ Task '{task_name}' created successfully!")
+                        st.session_state.dirty = True
                         time.sleep(1)
                         st.session_state.show_create_form = False
                         st.rerun()
@@ -317,83 +358,119 @@ if st.session_state.show_create_form:
 # Display Tasks
 st.subheader("📋 Your Tasks")
 
-# Fetch tasks
-filter_param = None if status_filter == "All" else status_filter
-
-with st.spinner("Loading tasks..."):
-    result = api_client.get_tasks(filter_param)
-
-if result["success"]:
-    data = result["data"]
+if dashboard["success"]:
+    data = dashboard["data"]
     tasks = data.get("tasks", [])
     
+    if not data.get("n8n_ok", True):
+        st.warning("⚠️ n8n is unreachable - showing cached tasks, which may be out of date")
+    
     if tasks:
         st.markdown(f"*Showing {len(tasks)} task(s)*")
         
-        # Display tasks
+        # Render all task cards as a single markdown element
+        cards = []
         for task in tasks:
             task_name = task.get("task_name", "Unnamed Task")
             task_status = task.get("status", "TODO")
             description = task.get("description", "No description")
             deadline = task.get("deadline", "No deadline")
             
-            # Status styling
-            status_class = {
-                "TODO": "todo",
-                "IN PROGRESS": "inprogress",
-                "DONE": "done"
-            }.get(task_status, "todo")
+            cards.append(
+                f'<div class="{STATUS_CLASS.get(task_status, STATUS_CLASS["TODO"])}">'
+                f'<h4>📌 {task_name}</h4>'
+                f'<p><strong>Status:</strong> {task_status}</p>'
+                f'<p><strong>Description:</strong> {description}</p>'
+                f'<p><strong>Deadline:</strong> {deadline}</p>'
+                '</div>'
+            )
+        
+        st.markdown("".join(cards), unsafe_allow_html=True)
+        
+        with st.expander("⚙️ Manage Tasks"):
+            # One editable table for all status changes instead of a
+            # selectbox per task
+            df = pd.DataFrame([
+                {
+                    "task_name": t.get("task_name", "Unnamed Task"),
+                    "status": t.get("status", "TODO"),
+                    "description": t.get("description"),
+                    "deadline": t.get("deadline")
+                }
+                for t in tasks
+            ])
             
-            # Display task card
-            with st.container():
-                col1, col2 = st.columns([3, 1])
-                
-                with col1:
-                    st.markdown(f"""
-                    <div class="task-card status-{status_class}">
-                        <h4>📌 {task_name}</h4>
-                        <p><strong>Status:</strong> {task_status}</p>
-                        <p><strong>Description:</strong> {description}</p>
-                        <p><strong>Deadline:</strong> {deadline}</p>
-                    </div>
-                    """, unsafe_allow_html=True)
+            edited = st.data_editor(
+                df,
+                column_config={
+                    "task_name": "Task",
+                    "status": st.column_config.SelectboxColumn(
+                        "Status",
+                        options=["TODO", "IN PROGRESS", "DONE"],
+                        required=True
+                    ),
+                    "description": "Description",
+                    "deadline": "Deadline"
+                },
+                disabled=["task_name", "description", "deadline"],
+                hide_index=True,
+                use_container_width=True,
+                key="tasks_editor"
+            )
+            
+            # Only rows whose status was actually edited are sent
+            changed = edited[edited["status"] != df["status"]]
+            
+            if st.button(
+                "🔄 Save Status Changes",
+                disabled=changed.empty,
+                use_container_width=True
+            ):
+                errors = []
+                with st.spinner("Updating..."):
+                    for row in changed.itertuples():
+                        result = api_client.update_task(
+                            row.task_name,
+                            {"status": row.status}
+                        )
+                        if not result["success"]:
+                            errors.append(f"{row.task_name}: {result['error']}")
                 
-                with col2:
-                    st.markdown("**Actions**")
-                    
-                    new_status = st.selectbox(
-                        "Change Status",
-                        ["TODO", "IN PROGRESS", "DONE"],
-                        key=f"status_{task_name}",
-                        label_visibility="collapsed"
-                    )
-                    
-                    if st.button("🔄 Update", key=f"update_{task_name}", use_container_width=True):
-                        with st.spinner("Updating..."):
-                            result = api_client.update_task(
-                                task_name,
-                                {"status": new_status}
-                            )
-                            if result["success"]:
-                                st.success("✅ Updated!")
-                                time.sleep(0.5)
-                                st.rerun()
-                            else:
-                                st.error(f"❌ {result['error']}")
-                    
-                    if st.button("🗑️ Delete", key=f"delete_{task_name}", use_container_width=True):
-                        with st.spinner("Deleting..."):
-                            result = api_client.delete_task(task_name)
-                            if result["success"]:
-                                st.success("✅ Deleted!")
-                                time.sleep(0.5)
-                                st.rerun()
-                            else:
-                                st.error(f"❌ {result['error']}")
+                st.session_state.dirty = True
+                if errors:
+                    st.error("❌ " + "; ".join(errors))
+                else:
+                    st.success("✅ Updated!")
+                    time.sleep(0.5)
+                    st.rerun()
+            
+            st.divider()
+            
+            col1, col2 = st.columns([2, 1])
+            
+            with col1:
+                task_name = st.selectbox(
+                    "Task",
+                    df["task_name"].tolist(),
+                    key="manage_task",
+                    label_visibility="collapsed"
+                )
+            
+            with col2:
+                if st.button("🗑️ Delete", key="delete_task", use_container_width=True):
+                    with st.spinner("Deleting..."):
+                        result = api_client.delete_task(task_name)
+                        if result["success"]:
+                            st.success("✅ Deleted!")
+                            st.session_state.dirty = True
+                            time.sleep(0.5)
+                            st.rerun()
+                        else:
+                            st.error(f"❌ {result['error']}")
     else:
         st.info("📭 No tasks found. Create your first task!")
 else:
-    st.error(f"❌ Error loading tasks: {result['error']}")
+    st.error(f"❌ Error loading tasks: {dashboard['error']}")
 
 # Natural Language Command Section
 with st.expander("💬 Natural Language Commands"):
@@ -411,6 +488,7 @@ with st.expander("💬 Natural Language Commands"):
                 result = api_client.send_message(custom_message)
                 if result["success"]:
                     st.success("✅ Command processed!")
+                    st.session_state.dirty = True
                     st.json(result["data"])
                     time.sleep(1)
                     st.rerun()
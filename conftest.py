@@ -0,0 +1,82 @@
+"""
+Shared fixtures for Task Manager API tests
+"""
+
+import asyncio
+import dis
+import inspect
+import pytest
+from httpx import AsyncClient, ASGITransport
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.main import app, cache_service
+
+
+@pytest.fixture(scope="session")
+def client():
+    """Test client fixture, built once per session"""
+    # ASGITransport holds no connections or event loop state, so a single
+    # client can be shared by every test's loop
+    ac = AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+    yield ac
+    asyncio.run(ac.aclose())
+
+
+@pytest.fixture(scope="session")
+def n8n_service_template():
+    """N8N service mock, built once per session"""
+    mock = MagicMock()
+    mock.send_message = AsyncMock()
+    mock.test_connection = AsyncMock()
+    return mock
+
+
+@pytest.fixture
+def mock_n8n_service(n8n_service_template):
+    """Mock N8N service, reset to its defaults for each test"""
+    mock = n8n_service_template
+    mock.reset_mock()
+    mock.send_message.side_effect = None
+    mock.send_message.return_value = {"tasks": []}
+    mock.test_connection.side_effect = None
+    mock.test_connection.return_value = True
+    
+    cache_service.clear()
+    with patch('app.main.n8n_service', mock), \
+            patch('app.main._last_health', (float("-inf"), False)):
+        yield mock
+
+
+def _referenced_names(func) -> set:
+    """
+    Names a function actually loads, including ones captured by closures
+    """
+    code = func.__code__
+    names = set(code.co_cellvars)
+    for instruction in dis.get_instructions(code):
+        if instruction.opname.startswith("LOAD_FAST"):
+            argval = instruction.argval
+            names.update(argval if isinstance(argval, tuple) else (argval,))
+    return names
+
+
+def pytest_collection_modifyitems(items):
+    """
+    Warn about tests that request a fixture they never use ("Test Maverick");
+    fixtures needed only for their side effects belong in usefixtures
+    """
+    for item in items:
+        func = getattr(item, "function", None)
+        if func is None:
+            continue
+        
+        requested = set(inspect.signature(func).parameters) - {"self"}
+        callspec = getattr(item, "callspec", None)
+        if callspec is not None:
+            requested -= set(callspec.params)
+        
+        for name in sorted(requested - _referenced_names(func)):
+            item.warn(pytest.PytestWarning(
+                f"requests fixture '{name}' but never uses it; "
+                f"drop it or use @pytest.mark.usefixtures('{name}')"
+            ))
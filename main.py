@@ -5,9 +5,15 @@ A production-ready REST API for task management with n8n integration
 
 from fastapi import FastAPI, HTTPException, status, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+from fastapi.encoders import jsonable_encoder
 from contextlib import asynccontextmanager
+import asyncio
 import logging
+import re
+import time
+from collections import Counter
 from datetime import datetime
 from typing import Optional
 
@@ -37,6 +43,26 @@ settings = get_settings()
 n8n_service = N8NService(settings.N8N_WEBHOOK_URL)
 cache_service = CacheService()
 
+# Upper bound on concurrent in-flight n8n webhook calls
+N8N_MAX_CONCURRENCY = 10
+n8n_semaphore = asyncio.Semaphore(N8N_MAX_CONCURRENCY)
+
+# Seconds a health probe result is reused before n8n is probed again
+HEALTH_CACHE_SECONDS = 5
+_last_health: tuple[float, bool] = (float("-inf"), False)
+
+# Messages that may change task data (invalidate the task cache)
+_MUTATION_RE = re.compile(
+    r"\b(?:re)?(?:creat|updat|delet|remov|chang)(?:e|es|ed|ing)\b|\badd(?:s|ed|ing)?\b",
+    re.I
+)
+
+# In-flight n8n fetches by cache key, shared by concurrent cache misses
+_inflight: dict[str, asyncio.Future] = {}
+
+# Bumped on every task mutation so fetches that started earlier don't cache
+_tasks_generation = 0
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -69,6 +95,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -81,11 +108,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress larger responses (task lists are highly repetitive JSON)
+app.add_middleware(GZipMiddleware, minimum_size=500)
+
 
 # Error handlers
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc):
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content=ErrorResponse(
             error=exc.detail,
@@ -98,7 +128,7 @@ async def http_exception_handler(request, exc):
 @app.exception_handler(Exception)
 async def general_exception_handler(request, exc):
     logger.error(f"Unhandled exception: {exc}", exc_info=True)
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content=ErrorResponse(
             error="Internal server error",
@@ -108,6 +138,120 @@ async def general_exception_handler(request, exc):
     )
 
 
+# Helpers
+
+async def _send_to_n8n(message: str, **kwargs) -> dict:
+    """
+    Send a message to n8n, bounding the number of concurrent webhook calls
+    """
+    async with n8n_semaphore:
+        return await n8n_service.send_message(message, **kwargs)
+
+
+async def _load_all_tasks() -> list:
+    """
+    Fetch the full task list from n8n and cache it
+    """
+    generation = _tasks_generation
+    response = await _send_to_n8n("Show me all tasks")
+    tasks = response.get("tasks", [])
+    
+    # Cache the results, unless a mutation landed while n8n was answering
+    if generation == _tasks_generation:
+        cache_service.set("all_tasks", tasks, ttl=60)
+    return tasks
+
+
+async def _fetch_all_tasks() -> list:
+    """
+    Return the full task list, calling n8n only on a cache miss
+    """
+    cached_tasks = cache_service.get("all_tasks")
+    if cached_tasks:
+        logger.info("Returning cached tasks")
+        return cached_tasks
+    
+    # Single-flight: concurrent cache misses share one n8n call
+    fetch = _inflight.get("all_tasks")
+    if fetch is None:
+        fetch = asyncio.ensure_future(_load_all_tasks())
+        _inflight["all_tasks"] = fetch
+        fetch.add_done_callback(lambda _: _inflight.pop("all_tasks", None))
+    
+    # Shield so one caller disconnecting doesn't cancel the others' fetch
+    return await asyncio.shield(fetch)
+
+
+async def _check_n8n() -> bool:
+    """
+    Probe n8n, reusing the last result for HEALTH_CACHE_SECONDS
+    """
+    global _last_health
+    
+    now = time.monotonic()
+    if now - _last_health[0] < HEALTH_CACHE_SECONDS:
+        return _last_health[1]
+    
+    n8n_connected = await n8n_service.test_connection()
+    _last_health = (now, n8n_connected)
+    return n8n_connected
+
+
+def _patch_cached_tasks(patch) -> None:
+    """
+    Apply a known mutation to the cached task list instead of invalidating it
+    """
+    global _tasks_generation
+    
+    _tasks_generation += 1
+    tasks = cache_service.get("all_tasks")
+    if tasks is None:
+        # Nothing cached - the next read fetches a fresh list anyway
+        return
+    # Keep the original expiry so repeated mutations don't extend a stale list
+    expires = cache_service.expiry["all_tasks"]
+    cache_service.set("all_tasks", patch(tasks))
+    cache_service.expiry["all_tasks"] = expires
+
+
+def _invalidate_cached_tasks() -> None:
+    """
+    Drop the cached task list after a mutation whose effect is unknown
+    """
+    global _tasks_generation
+    
+    _tasks_generation += 1
+    cache_service.delete("all_tasks")
+
+
+def _filter_tasks(tasks: list, status_filter: Optional[str]) -> list:
+    """
+    Filter a task list by status (no-op when no filter is given)
+    """
+    if not status_filter:
+        return tasks
+    return [t for t in tasks if t.get("status") == status_filter]
+
+
+def _compute_stats(tasks: list) -> dict:
+    """
+    Calculate task statistics from a task list
+    """
+    counts = Counter(t.get("status") for t in tasks)
+    total = len(tasks)
+    
+    return {
+        "total_tasks": total,
+        "by_status": {
+            "TODO": counts["TODO"],
+            "IN PROGRESS": counts["IN PROGRESS"],
+            "DONE": counts["DONE"]
+        },
+        "completion_rate": round((counts["DONE"] / total) * 100, 2) if total else 0.0,
+        "timestamp": datetime.utcnow()
+    }
+
+
 # Health check endpoint
 @app.get("/health", response_model=HealthResponse, tags=["System"])
 async def health_check():
@@ -115,7 +259,7 @@ async def health_check():
     Health check endpoint for monitoring
     """
     try:
-        n8n_connected = await n8n_service.test_connection()
+        n8n_connected = await _check_n8n()
         
         return HealthResponse(
             status="healthy" if n8n_connected else "degraded",
@@ -166,35 +310,24 @@ async def get_tasks(
     - **use_cache**: Whether to use cached results (default: True)
     """
     try:
-        # Check cache first
         if use_cache:
-            cached_tasks = cache_service.get("all_tasks")
-            if cached_tasks:
-                logger.info("Returning cached tasks")
-                tasks = cached_tasks
-            else:
-                message = "Show me all tasks"
-                if status_filter:
-                    message = f"Show me all tasks with status {status_filter}"
-                
-                response = await n8n_service.send_message(message)
-                tasks = response.get("tasks", [])
-                
-                # Cache the results
-                cache_service.set("all_tasks", tasks, ttl=60)
+            # The cache always holds the full list; filter it locally
+            tasks = _filter_tasks(await _fetch_all_tasks(), status_filter)
         else:
             message = "Show me all tasks"
             if status_filter:
                 message = f"Show me all tasks with status {status_filter}"
             
-            response = await n8n_service.send_message(message)
+            response = await _send_to_n8n(message)
             tasks = response.get("tasks", [])
         
-        return TaskListResponse(
-            tasks=tasks,
-            count=len(tasks),
-            timestamp=datetime.utcnow()
-        )
+        # Serialize directly; TaskListResponse stays the documented schema
+        # but re-validating every task through Pydantic is skipped
+        return ORJSONResponse({
+            "tasks": tasks,
+            "count": len(tasks),
+            "timestamp": datetime.utcnow()
+        })
         
     except Exception as e:
         logger.error(f"Error fetching tasks: {e}")
@@ -228,10 +361,11 @@ async def create_task(task: TaskCreate):
             message += f" with deadline '{task.deadline}'"
         
         logger.info(f"Creating task: {task.task_name}")
-        response = await n8n_service.send_message(message)
+        response = await _send_to_n8n(message)
         
-        # Invalidate cache
-        cache_service.delete("all_tasks")
+        # Keep the cache warm with the new task
+        new_task = jsonable_encoder(task)
+        _patch_cached_tasks(lambda tasks: tasks + [new_task])
         
         return TaskResponse(
             success=True,
@@ -281,10 +415,14 @@ async def update_task(task_name: str, task_update: TaskUpdate):
         message += " - change " + ", ".join(updates)
         
         logger.info(f"Updating task: {task_name}")
-        response = await n8n_service.send_message(message)
+        response = await _send_to_n8n(message)
         
-        # Invalidate cache
-        cache_service.delete("all_tasks")
+        # Apply the update to the cached task
+        changes = jsonable_encoder(task_update, exclude_none=True)
+        _patch_cached_tasks(lambda tasks: [
+            {**t, **changes} if t.get("task_name") == task_name else t
+            for t in tasks
+        ])
         
         return TaskResponse(
             success=True,
@@ -314,10 +452,12 @@ async def delete_task(task_name: str):
         message = f"Delete the task '{task_name}' - yes, I'm sure"
         
         logger.info(f"Deleting task: {task_name}")
-        response = await n8n_service.send_message(message)
+        response = await _send_to_n8n(message)
         
-        # Invalidate cache
-        cache_service.delete("all_tasks")
+        # Drop the task from the cache
+        _patch_cached_tasks(lambda tasks: [
+            t for t in tasks if t.get("task_name") != task_name
+        ])
         
         return TaskResponse(
             success=True,
@@ -347,15 +487,14 @@ async def send_message(message_request: MessageRequest):
     try:
         logger.info(f"Processing message: {message_request.message[:50]}...")
         
-        response = await n8n_service.send_message(
+        response = await _send_to_n8n(
             message_request.message,
             session_id=message_request.session_id
         )
         
         # Invalidate cache if message might have changed data
-        action_keywords = ["create", "update", "delete", "add", "remove", "change"]
-        if any(keyword in message_request.message.lower() for keyword in action_keywords):
-            cache_service.delete("all_tasks")
+        if _MUTATION_RE.search(message_request.message):
+            _invalidate_cached_tasks()
         
         return MessageResponse(
             response=response,
@@ -377,27 +516,8 @@ async def get_task_stats():
     Get task statistics and analytics
     """
     try:
-        response = await n8n_service.send_message("Show me all tasks")
-        tasks = response.get("tasks", [])
-        
-        # Calculate statistics
-        stats = {
-            "total_tasks": len(tasks),
-            "by_status": {
-                "TODO": sum(1 for t in tasks if t.get("status") == "TODO"),
-                "IN PROGRESS": sum(1 for t in tasks if t.get("status") == "IN PROGRESS"),
-                "DONE": sum(1 for t in tasks if t.get("status") == "DONE")
-            },
-            "completion_rate": 0.0,
-            "timestamp": datetime.utcnow()
-        }
-        
-        if stats["total_tasks"] > 0:
-            stats["completion_rate"] = round(
-                (stats["by_status"]["DONE"] / stats["total_tasks"]) * 100, 2
-            )
-        
-        return stats
+        tasks = await _fetch_all_tasks()
+        return _compute_stats(tasks)
         
     except Exception as e:
         logger.error(f"Error fetching stats: {e}")
@@ -407,6 +527,42 @@ async def get_task_stats():
         )
 
 
+# Dashboard endpoint (single round trip for the frontend page load)
+@app.get("/api/v1/dashboard", tags=["Analytics"])
+async def get_dashboard(status_filter: Optional[str] = None):
+    """
+    Get tasks, statistics and n8n health in a single call
+    
+    - **status_filter**: Optional filter by status for the task list;
+      statistics always cover all tasks
+    """
+    try:
+        all_tasks = await _fetch_all_tasks()
+    except Exception as e:
+        logger.error(f"Error fetching dashboard: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to fetch dashboard: {str(e)}"
+        )
+    
+    # Tasks may come from cache, so probe n8n for the health flag
+    try:
+        n8n_ok = await _check_n8n()
+    except Exception as e:
+        logger.error(f"Health check failed: {e}")
+        n8n_ok = False
+    
+    tasks = _filter_tasks(all_tasks, status_filter)
+    
+    return ORJSONResponse({
+        "tasks": tasks,
+        "count": len(tasks),
+        "stats": _compute_stats(all_tasks),
+        "n8n_ok": n8n_ok,
+        "timestamp": datetime.utcnow()
+    })
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
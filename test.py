@@ -2,151 +2,248 @@
 Tests for Task Manager API
 """
 
+import asyncio
+import orjson
 import pytest
-from fastapi.testclient import TestClient
-from unittest.mock import AsyncMock, patch
-import sys
-import os
+from datetime import datetime
+from pydantic import BaseModel
 
-# Add parent directory to path
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend')))
+from app.main import cache_service, _fetch_all_tasks
+from app.services.cache_service import CacheService
 
-from app.main import app
+# Everything here runs in memory against mocks
+pytestmark = [pytest.mark.fast, pytest.mark.unit]
 
+# Task list returned by the mocked n8n service
+MOCK_TASKS = [
+    {
+        "task_name": "Test Task",
+        "status": "TODO",
+        "description": "Test description",
+        "deadline": "2025-12-31"
+    },
+    {
+        "task_name": "Done Task",
+        "status": "DONE",
+        "description": "Finished",
+        "deadline": "2025-11-30"
+    }
+]
 
-@pytest.fixture
-def client():
-    """Test client fixture"""
-    return TestClient(app)
+# Request bodies encoded once at import rather than on every request
+JSON_HEADERS = {"content-type": "application/json"}
+CREATE_TASK_BODY = orjson.dumps({
+    "task_name": "New Task",
+    "status": "TODO",
+    "description": "Test task",
+    "deadline": "2025-12-31"
+})
+NEW_TASK_BODY = orjson.dumps({"task_name": "New Task", "status": "TODO"})
+UPDATE_TASK_BODY = orjson.dumps({"status": "IN PROGRESS"})
+SEND_MESSAGE_BODY = orjson.dumps({
+    "message": "Show me all tasks",
+    "session_id": "test-session"
+})
+
+
+# Expected response shapes, validated in one step instead of per-key asserts
+
+class HealthResp(BaseModel):
+    status: str
+    timestamp: datetime
+    services: dict
+
+
+class RootResp(BaseModel):
+    message: str
+    version: str
+
+
+class TasksResp(BaseModel):
+    tasks: list
+    count: int
+
+
+class MessageResp(BaseModel):
+    response: dict
+    timestamp: datetime
+
+
+class StatsResp(BaseModel):
+    total_tasks: int
+    by_status: dict[str, int]
+    completion_rate: float
+
+
+_cache_singleton = CacheService()
 
 
 @pytest.fixture
-def mock_n8n_service():
-    """Mock N8N service"""
-    with patch('app.main.n8n_service') as mock:
-        mock.send_message = AsyncMock(return_value={"tasks": []})
-        mock.test_connection = AsyncMock(return_value=True)
-        yield mock
+def cache():
+    """Shared CacheService instance, emptied for each test"""
+    _cache_singleton.clear()
+    return _cache_singleton
+
+
+class TestGetEndpoints:
+    """Smoke tests for read-only endpoints"""
+    
+    @pytest.mark.usefixtures("mock_n8n_service")
+    @pytest.mark.parametrize("url,model", [
+        ("/health", HealthResp),
+        ("/api/v1/tasks", TasksResp),
+        ("/api/v1/tasks?status_filter=TODO", TasksResp),
+    ])
+    async def test_get_endpoint(self, client, url, model):
+        """Test endpoint responds with the expected shape"""
+        response = await client.get(url)
+        
+        assert response.status_code == 200
+        model.model_validate(response.json())
 
 
 class TestHealthEndpoint:
     """Tests for health check endpoint"""
     
-    def test_health_check_success(self, client, mock_n8n_service):
-        """Test successful health check"""
-        mock_n8n_service.test_connection.return_value = True
-        
-        response = client.get("/health")
+    async def test_health_check_reuses_recent_probe(self, client, mock_n8n_service):
+        """Test back-to-back health checks probe n8n only once"""
+        await client.get("/health")
+        response = await client.get("/health")
         
         assert response.status_code == 200
-        data = response.json()
-        assert "status" in data
-        assert "timestamp" in data
-        assert "services" in data
+        assert mock_n8n_service.test_connection.call_count == 1
 
 
 class TestRootEndpoint:
     """Tests for root endpoint"""
     
-    def test_root_endpoint(self, client):
+    async def test_root_endpoint(self, client):
         """Test root endpoint returns API info"""
-        response = client.get("/")
+        response = await client.get("/")
         
         assert response.status_code == 200
-        data = response.json()
-        assert "message" in data
-        assert "version" in data
-        assert data["message"] == "Task Manager API"
+        assert RootResp.model_validate(response.json()).message == "Task Manager API"
 
 
 class TestTaskEndpoints:
     """Tests for task management endpoints"""
     
-    def test_get_tasks_success(self, client, mock_n8n_service):
+    async def test_get_tasks_success(self, client, mock_n8n_service):
         """Test successful task retrieval"""
-        mock_tasks = [
-            {
-                "task_name": "Test Task",
-                "status": "TODO",
-                "description": "Test description",
-                "deadline": "2025-12-31"
-            }
-        ]
-        mock_n8n_service.send_message.return_value = {"tasks": mock_tasks}
+        mock_n8n_service.send_message.return_value = {"tasks": MOCK_TASKS}
         
-        response = client.get("/api/v1/tasks")
+        response = await client.get("/api/v1/tasks")
         
         assert response.status_code == 200
-        data = response.json()
-        assert "tasks" in data
-        assert "count" in data
-        assert data["count"] == 1
+        assert TasksResp.model_validate(response.json()).count == 2
     
-    def test_get_tasks_with_filter(self, client, mock_n8n_service):
+    async def test_get_tasks_with_filter(self, client, mock_n8n_service):
         """Test task retrieval with status filter"""
-        mock_n8n_service.send_message.return_value = {"tasks": []}
+        mock_n8n_service.send_message.return_value = {"tasks": MOCK_TASKS}
         
-        response = client.get("/api/v1/tasks?status_filter=TODO")
+        response = await client.get("/api/v1/tasks?status_filter=TODO")
         
         assert response.status_code == 200
-        mock_n8n_service.send_message.assert_called_once()
+        data = TasksResp.model_validate(response.json())
+        assert data.count == 1
+        assert data.tasks == [MOCK_TASKS[0]]
+        assert mock_n8n_service.send_message.call_count == 1
+    
+    async def test_get_tasks_single_flight(self, mock_n8n_service):
+        """Test concurrent cache misses share a single n8n call"""
+        async def slow_send(message, **kwargs):
+            await asyncio.sleep(0.01)
+            return {"tasks": [{"task_name": "Test Task", "status": "TODO"}]}
+        
+        mock_n8n_service.send_message.side_effect = slow_send
+        
+        first, second = await asyncio.gather(_fetch_all_tasks(), _fetch_all_tasks())
+        
+        assert first == second
+        assert mock_n8n_service.send_message.call_count == 1
     
-    def test_create_task_success(self, client, mock_n8n_service):
+    async def test_create_task_success(self, client, mock_n8n_service):
         """Test successful task creation"""
         mock_n8n_service.send_message.return_value = {"success": True}
         
-        task_data = {
-            "task_name": "New Task",
-            "status": "TODO",
-            "description": "Test task",
-            "deadline": "2025-12-31"
-        }
-        
-        response = client.post("/api/v1/tasks", json=task_data)
+        response = await client.post(
+            "/api/v1/tasks", content=CREATE_TASK_BODY, headers=JSON_HEADERS
+        )
         
         assert response.status_code == 201
         data = response.json()
         assert data["success"] is True
         assert "Task 'New Task' created successfully" in data["message"]
     
-    def test_create_task_validation_error(self, client):
-        """Test task creation with invalid data"""
-        task_data = {
-            "task_name": "",  # Invalid: empty name
-            "status": "TODO"
-        }
+    async def test_create_task_patches_cache(self, client, mock_n8n_service):
+        """Test task creation updates the cached list without a re-fetch"""
+        cache_service.set("all_tasks", [{"task_name": "Test Task", "status": "TODO"}])
+        mock_n8n_service.send_message.return_value = {"success": True}
         
-        response = client.post("/api/v1/tasks", json=task_data)
+        await client.post("/api/v1/tasks", content=NEW_TASK_BODY, headers=JSON_HEADERS)
+        response = await client.get("/api/v1/tasks")
         
-        assert response.status_code == 422  # Validation error
+        assert response.json()["count"] == 2
+        assert mock_n8n_service.send_message.call_count == 1
     
-    def test_update_task_success(self, client, mock_n8n_service):
-        """Test successful task update"""
+    async def test_update_during_fetch_is_not_lost(self, client, mock_n8n_service):
+        """Test a list fetched before an update is not cached after it"""
+        async def send(message, **kwargs):
+            if message == "Show me all tasks":
+                await asyncio.sleep(0.05)
+                return {"tasks": [{"task_name": "Test Task", "status": "TODO"}]}
+            return {"success": True}
+        
+        mock_n8n_service.send_message.side_effect = send
+        
+        fetch = asyncio.ensure_future(client.get("/api/v1/tasks"))
+        await asyncio.sleep(0.01)
+        await client.put(
+            "/api/v1/tasks/Test Task", content=UPDATE_TASK_BODY, headers=JSON_HEADERS
+        )
+        await fetch
+        
+        assert cache_service.get("all_tasks") is None
+    
+    async def test_create_task_keeps_cache_expiry(self, client, mock_n8n_service):
+        """Test patching the cached list does not extend its lifetime"""
+        cache_service.set("all_tasks", [{"task_name": "Test Task", "status": "TODO"}])
+        expires = cache_service.expiry["all_tasks"]
         mock_n8n_service.send_message.return_value = {"success": True}
         
-        update_data = {
-            "status": "IN PROGRESS"
-        }
+        await client.post("/api/v1/tasks", content=NEW_TASK_BODY, headers=JSON_HEADERS)
         
-        response = client.put("/api/v1/tasks/Test Task", json=update_data)
+        assert cache_service.expiry["all_tasks"] == expires
+    
+    @pytest.mark.parametrize("method,url,payload,code", [
+        # Invalid: empty name
+        ("post", "/api/v1/tasks", {"task_name": "", "status": "TODO"}, 422),
+        # No fields to update
+        ("put", "/api/v1/tasks/Test Task", {}, 400),
+    ])
+    async def test_bad_payload(self, client, method, url, payload, code):
+        """Test invalid task payloads are rejected before reaching n8n"""
+        response = await getattr(client, method)(url, json=payload)
         
-        assert response.status_code == 200
-        data = response.json()
-        assert data["success"] is True
+        assert response.status_code == code
     
-    def test_update_task_no_fields(self, client):
-        """Test task update with no fields"""
-        update_data = {}
+    async def test_update_task_success(self, client, mock_n8n_service):
+        """Test successful task update"""
+        mock_n8n_service.send_message.return_value = {"success": True}
         
-        response = client.put("/api/v1/tasks/Test Task", json=update_data)
+        response = await client.put(
+            "/api/v1/tasks/Test Task", content=UPDATE_TASK_BODY, headers=JSON_HEADERS
+        )
         
-        assert response.status_code == 400
+        assert response.status_code == 200
+        data = response.json()
+        assert data["success"] is True
     
-    def test_delete_task_success(self, client, mock_n8n_service):
+    async def test_delete_task_success(self, client, mock_n8n_service):
         """Test successful task deletion"""
         mock_n8n_service.send_message.return_value = {"success": True}
         
-        response = client.delete("/api/v1/tasks/Test Task")
+        response = await client.delete("/api/v1/tasks/Test Task")
         
         assert response.status_code == 200
         data = response.json()
@@ -156,30 +253,43 @@ class TestTaskEndpoints:
 class TestMessageEndpoint:
     """Tests for natural language message endpoint"""
     
-    def test_send_message_success(self, client, mock_n8n_service):
+    async def test_send_message_success(self, client, mock_n8n_service):
         """Test successful message processing"""
         mock_n8n_service.send_message.return_value = {
             "output": "Here are your tasks",
             "tasks": []
         }
         
-        message_data = {
-            "message": "Show me all tasks",
-            "session_id": "test-session"
-        }
-        
-        response = client.post("/api/v1/message", json=message_data)
+        response = await client.post(
+            "/api/v1/message", content=SEND_MESSAGE_BODY, headers=JSON_HEADERS
+        )
         
         assert response.status_code == 200
-        data = response.json()
-        assert "response" in data
-        assert "timestamp" in data
+        MessageResp.model_validate(response.json())
+    
+    @pytest.mark.parametrize("body,cached", [
+        (orjson.dumps({"message": "Create a task called Report"}), False),
+        (orjson.dumps({"message": "I updated the Report task"}), False),
+        (orjson.dumps({"message": "Recreate the Report task"}), False),
+        (SEND_MESSAGE_BODY, True),
+        (orjson.dumps({"message": "Show tasks for the new address"}), True),
+    ])
+    async def test_send_message_cache_invalidation(
+        self, client, mock_n8n_service, body, cached
+    ):
+        """Test only messages that may change tasks drop the cached list"""
+        cache_service.set("all_tasks", [{"task_name": "Report", "status": "TODO"}])
+        mock_n8n_service.send_message.return_value = {"output": "OK"}
+        
+        await client.post("/api/v1/message", content=body, headers=JSON_HEADERS)
+        
+        assert (cache_service.get("all_tasks") is not None) == cached
 
 
 class TestStatsEndpoint:
     """Tests for statistics endpoint"""
     
-    def test_get_stats_success(self, client, mock_n8n_service):
+    async def test_get_stats_success(self, client, mock_n8n_service):
         """Test successful stats retrieval"""
         mock_tasks = [
             {"status": "TODO"},
@@ -188,52 +298,66 @@ class TestStatsEndpoint:
         ]
         mock_n8n_service.send_message.return_value = {"tasks": mock_tasks}
         
-        response = client.get("/api/v1/stats")
+        response = await client.get("/api/v1/stats")
+        
+        assert response.status_code == 200
+        stats = StatsResp.model_validate(response.json())
+        assert stats.total_tasks == 3
+        assert stats.completion_rate > 0
+
+
+class TestDashboardEndpoint:
+    """Tests for dashboard endpoint"""
+    
+    async def test_get_dashboard_success(self, client, mock_n8n_service):
+        """Test dashboard returns tasks and stats from a single n8n call"""
+        mock_tasks = [
+            {"task_name": "A", "status": "TODO"},
+            {"task_name": "B", "status": "DONE"}
+        ]
+        mock_n8n_service.send_message.return_value = {"tasks": mock_tasks}
+        
+        response = await client.get("/api/v1/dashboard?status_filter=DONE")
         
         assert response.status_code == 200
         data = response.json()
-        assert "total_tasks" in data
-        assert "by_status" in data
-        assert "completion_rate" in data
-        assert data["total_tasks"] == 3
-        assert data["completion_rate"] > 0
+        assert data["count"] == 1
+        assert data["stats"]["total_tasks"] == 2
+        assert data["n8n_ok"] is True
+        assert mock_n8n_service.send_message.call_count == 1
+    
+    async def test_get_dashboard_n8n_failure(self, client, mock_n8n_service):
+        """Test dashboard reports an error instead of an empty task list"""
+        mock_n8n_service.send_message.side_effect = Exception("n8n down")
+        
+        response = await client.get("/api/v1/dashboard")
+        
+        assert response.status_code == 500
 
 
+@pytest.mark.timeout(1)
 class TestCacheService:
     """Tests for cache service"""
     
-    def test_cache_set_and_get(self):
+    def test_cache_set_and_get(self, cache):
         """Test cache set and get operations"""
-        from app.services.cache_service import CacheService
-        
-        cache = CacheService()
         cache.set("test_key", "test_value", ttl=60)
         
         assert cache.get("test_key") == "test_value"
     
-    def test_cache_expiry(self):
+    def test_cache_expiry(self, cache):
         """Test cache expiry"""
-        from app.services.cache_service import CacheService
-        from datetime import datetime, timedelta
-        
-        cache = CacheService()
         cache.set("test_key", "test_value", ttl=0)
         
         # Force expiry
-        cache.expiry["test_key"] = datetime.utcnow() - timedelta(seconds=1)
+        cache.expiry["test_key"] = datetime.min
         
         assert cache.get("test_key") is None
     
-    def test_cache_delete(self):
+    def test_cache_delete(self, cache):
         """Test cache deletion"""
-        from app.services.cache_service import CacheService
-        
-        cache = CacheService()
         cache.set("test_key", "test_value")
         cache.delete("test_key")
         
         assert cache.get("test_key") is None
 
-
-if __name__ == "__main__":
-    pytest.main([__file__, "-v"])
\ No newline at end of file
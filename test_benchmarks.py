@@ -0,0 +1,66 @@
+"""
+Benchmarks for Task Manager API endpoints and the cache service
+
+Run with: pytest test_benchmarks.py -m slow
+
+PYTEST_DONT_REWRITE - asserts inside timed loops run as plain asserts
+"""
+
+import orjson
+import pytest
+
+from app.services.cache_service import CacheService
+
+# Benchmarks calibrate over many rounds; keep them out of `pytest -m fast`
+pytestmark = pytest.mark.slow
+
+# Encoded once so JSON serialization is not timed in every round
+JSON_HEADERS = {"content-type": "application/json"}
+CREATE_TASK_BODY = orjson.dumps({
+    "task_name": "New Task",
+    "status": "TODO",
+    "description": "Benchmark task",
+    "deadline": "2025-12-31"
+})
+
+
+async def test_bench_get_tasks(async_benchmark, client, mock_n8n_service):
+    """Benchmark task list retrieval"""
+    mock_n8n_service.send_message.return_value = {
+        "tasks": [
+            {"task_name": f"Task {i}", "status": "TODO", "description": "Benchmark task"}
+            for i in range(100)
+        ]
+    }
+
+    response = await client.get("/api/v1/tasks")
+    assert response.status_code == 200
+
+    # Timed on the test's running loop, so no event loop start-up per round
+    await async_benchmark(client.get, "/api/v1/tasks")
+
+
+async def test_bench_create_task(async_benchmark, client, mock_n8n_service):
+    """Benchmark task creation"""
+    mock_n8n_service.send_message.return_value = {"success": True}
+
+    response = await client.post(
+        "/api/v1/tasks", content=CREATE_TASK_BODY, headers=JSON_HEADERS
+    )
+    assert response.status_code == 201
+
+    await async_benchmark(
+        client.post, "/api/v1/tasks", content=CREATE_TASK_BODY, headers=JSON_HEADERS
+    )
+
+
+async def test_bench_cache_round_trip(async_benchmark):
+    """Benchmark cache set/get round trips"""
+    cache = CacheService()
+
+    async def round_trip():
+        for i in range(1000):
+            cache.set(f"task_{i}", i, ttl=60)
+            assert cache.get(f"task_{i}") == i
+
+    await async_benchmark(round_trip)